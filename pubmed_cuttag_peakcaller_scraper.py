@@ -10,32 +10,380 @@ Author: Generated for bioinformatics automation
 Date: 2024
 """
 
+import asyncio
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
+from lxml import etree
 import time
 import re
 import json
 import csv
-from typing import List, Dict, Optional
+import os
+import sqlite3
+import hashlib
+import threading
+import io
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Tuple, Union
 from urllib.parse import quote
 import argparse
 from datetime import datetime
 
+try:
+    import ahocorasick
+except ImportError:  # optional; fall back to plain substring search
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the json module
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional; only needed for --format parquet
+    pa = pq = None
+
+# XPath expressions for PubmedArticle fields, compiled once at import
+_X_PMID = etree.XPath('.//PMID')
+_X_TITLE = etree.XPath('.//ArticleTitle')
+_X_ABSTRACT = etree.XPath('.//Article/Abstract/AbstractText')
+_X_AUTHORS = etree.XPath('.//Author')
+_X_JOURNAL = etree.XPath('.//Journal/Title')
+_X_PUBDATE = etree.XPath('.//PubDate')
+
+def _json_loads(data: Union[bytes, str]):
+    """Parse JSON from raw bytes or text (single pass in C with orjson)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj) -> str:
+    """Serialize an object as compact JSON text (in C with orjson)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+def _json_line(obj) -> bytes:
+    """Serialize an object as one UTF-8 encoded JSON Lines record."""
+    if orjson is not None:
+        return orjson.dumps(obj) + b'\n'
+    return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+
+def _is_rate_limited(error: requests.RequestException) -> bool:
+    """True if the request failed with HTTP 429 (after the adapter's retries)."""
+    return (isinstance(error, requests.HTTPError) and error.response is not None
+            and error.response.status_code == 429)
+
+def _run_sync(coroutine):
+    """
+    Run a coroutine to completion from synchronous code and return its result.
+    
+    asyncio.run() refuses to start inside a running event loop (a Jupyter
+    cell, or a sync method called from async code), so there the coroutine
+    gets its own loop on a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+@contextlib.contextmanager
+def _stream_errors_as_requests():
+    """
+    Re-raise urllib3 errors from reading response.raw as requests exceptions.
+    
+    Streamed bodies are handed to the parser as response.raw, which bypasses
+    the translation requests normally does in iter_content.
+    """
+    try:
+        yield
+    except urllib3.exceptions.HTTPError as e:
+        raise requests.ConnectionError(e) from e
+
+# Bump when extractor logic changes in a way that changes its output, so
+# cached analysis results are recomputed
+EXTRACTOR_VERSION = 3
+
+# Search query used when --query is not given; left out of output filenames
+DEFAULT_QUERY = 'CUT&Tag OR "CUT and Tag"'
+
+class RateLimiter:
+    """
+    Thread-safe token bucket that lets at most `rate` requests start per second.
+    
+    Every request thread, sync or async, claims a slot here just before it
+    sends, so the limit holds across all of them.
+    """
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._pauses = 0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """Block until the next request slot is free, then claim it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                slot = max(now, self._next_slot)
+                self._next_slot = slot + self.interval
+                pauses = self._pauses
+            if slot > now:
+                time.sleep(slot - now)
+            
+            # If a pause began while waiting, queue up again behind it
+            with self._lock:
+                if self._pauses == pauses:
+                    return
+    
+    def pause(self, seconds: float):
+        """Hold back every request that has not been sent yet for `seconds`."""
+        with self._lock:
+            self._pauses += 1
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+class BackoffRetry(Retry):
+    """
+    urllib3 Retry that shares NCBI's Retry-After with a RateLimiter.
+    
+    The stock Retry only sleeps in the thread that got the 429; pausing the
+    limiter as well keeps the other concurrent requests from piling on.
+    """
+    
+    def __init__(self, *args, rate_limiter: Optional[RateLimiter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+    
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+    
+    def sleep_for_retry(self, response=None) -> bool:
+        retry_after = self.get_retry_after(response) if response is not None else None
+        if retry_after and self.rate_limiter is not None:
+            self.rate_limiter.pause(retry_after)
+        return super().sleep_for_retry(response)
+
+class ResponseCache:
+    """
+    SQLite store of E-utilities responses keyed by URL and query parameters.
+    
+    Entries younger than `max_age` seconds are served without touching the
+    network. Older entries are revalidated with If-None-Match/If-Modified-Since
+    when the server sent an ETag or Last-Modified header.
+    """
+    
+    def __init__(self, path: str, max_age: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, fetched_at REAL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(url: str, params: Dict) -> str:
+        """Build a cache key; credentials are left out so they don't split the cache."""
+        items = sorted(
+            (k, ','.join(v) if isinstance(v, list) else str(v))
+            for k, v in params.items() if k not in ('email', 'api_key')
+        )
+        return hashlib.sha1(json.dumps([url, items]).encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Tuple[Optional[str], Optional[str], bytes, float]]:
+        """Return (etag, last_modified, body, fetched_at) or None."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, body, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+    
+    def put(self, key: str, etag: Optional[str], last_modified: Optional[str], body: bytes):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, etag, last_modified, body, time.time())
+            )
+            self._conn.commit()
+    
+    def put_many(self, bodies: Dict[str, bytes]):
+        """Store several bodies that have no ETag or Last-Modified, in one transaction."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO responses VALUES (?, NULL, NULL, ?, ?)",
+                [(key, body, now) for key, body in bodies.items()]
+            )
+            self._conn.commit()
+    
+    def touch(self, key: str):
+        """Mark an entry as fresh again after a 304 Not Modified."""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+    
+    def is_fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.max_age
+
+class AnalysisCache:
+    """
+    SQLite store of extractor results keyed by a hash of the scanned text.
+    
+    Each row also records a hash of the extractor patterns, so results are
+    recomputed whenever the patterns (or EXTRACTOR_VERSION) change.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analysis ("
+            "content_sha1 TEXT PRIMARY KEY, patterns_sha1 TEXT, "
+            "peak_json TEXT, cuttag_json TEXT, chipseq_json TEXT)"
+        )
+        self._conn.commit()
+    
+    def get(self, content_sha1: str, patterns_sha1: str) -> Optional[Tuple[List[str], List[str], List[str]]]:
+        """Return (peak, CUT&Tag, ChIP-seq) mentions if cached for these patterns."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT peak_json, cuttag_json, chipseq_json FROM analysis "
+                "WHERE content_sha1 = ? AND patterns_sha1 = ?", (content_sha1, patterns_sha1)
+            ).fetchone()
+        if row is None:
+            return None
+        return tuple(_json_loads(column) for column in row)
+    
+    def put(self, content_sha1: str, patterns_sha1: str,
+            results: Tuple[List[str], List[str], List[str]]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis VALUES (?, ?, ?, ?, ?)",
+                (content_sha1, patterns_sha1, *(_json_dumps(r) for r in results))
+            )
+            self._conn.commit()
+
 class PubMedCUTTagScraper:
-    def __init__(self, email: str = "your.email@example.com", api_key: Optional[str] = None):
+    # Variants reported under their main software
+    CALLER_ALIASES = {'macs2': 'MACS', 'macs3': 'MACS', 'findpeaks': 'HOMER'}
+    
+    # Substrings that mark a peak caller name as a false positive
+    FALSE_POSITIVE_PATTERNS = {
+        'quest': ('question', 'questionnaire', 'request', 'conquest'),
+        'macs': ('macintosh', 'mac address', 'macbook'),
+        'homer': ('homer simpson', 'homeric', 'homerun'),
+        'peaks': ('mountain peaks', 'peak performance', 'peak hours'),
+    }
+    
+    # Columns of the CSV output, in order
+    RESULT_FIELDS = [
+        'pmid', 'title', 'abstract', 'authors', 'journal', 'publication_date',
+        'peak_calling_mentions', 'text_source', 'cuttag_mentions', 'has_cuttag',
+        'chipseq_mentions', 'has_chipseq', 'pubmed_link', 'year_published',
+        'identified_peak_callers', 'peak_calling_summary'
+    ]
+    
+    # Output columns holding lists of strings or booleans (typed columns in Parquet)
+    LIST_FIELDS = ('peak_calling_mentions', 'cuttag_mentions', 'chipseq_mentions', 'identified_peak_callers')
+    BOOL_FIELDS = ('has_cuttag', 'has_chipseq')
+    
+    # Rows buffered per Parquet row group
+    PARQUET_ROW_GROUP_SIZE = 1000
+    
+    # Size of the pieces the text is lowercased in for the peak caller automaton
+    _LOWER_CHUNK_SIZE = 1 << 16
+    
+    # Seconds to wait for a connection or for data before giving up on a request
+    REQUEST_TIMEOUT = 30
+    
+    # PMIDs per efetch POST; NCBI takes up to 10,000 IDs per request, and
+    # keyless clients keep to smaller requests
+    EFETCH_BATCH_SIZE = 500
+    EFETCH_BATCH_SIZE_WITH_KEY = 10000
+    
+    # Times an efetch batch is requested before the papers it has not
+    # returned yet are given up on (a stream can fail partway through)
+    EFETCH_ATTEMPTS = 3
+    
+    # Parsed articles whose XML is written to the cache together
+    ARTICLE_CACHE_FLUSH_SIZE = 200
+    
+    # Papers whose full texts are fetched and scanned together by analyze_papers
+    ANALYSIS_WINDOW = 500
+    
+    # Words that indicate a methods/peak calling context
+    METHODS_KEYWORDS = ('peak', 'calling', 'detection', 'identification', 'analysis',
+                        'software', 'tool', 'algorithm', 'method')
+    
+    def __init__(self, email: str = "your.email@example.com", api_key: Optional[str] = None,
+                 cache_dir: Optional[str] = None, workers: Optional[int] = None):
         """
         Initialize the PubMed scraper.
         
         Args:
             email: Your email address (required by NCBI)
             api_key: Optional API key for higher rate limits
+            cache_dir: Optional directory for the on-disk response cache
+            workers: Number of processes used to scan papers (default: CPU count)
         """
+        self.workers = workers or os.cpu_count() or 1
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
         self.pmc_base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
         self.email = email
         self.api_key = api_key
+        
+        # NCBI allows 10 requests/second with an API key and 3 without
+        self.max_requests_per_second = 10 if api_key else 3
+        self._rate_limiter = RateLimiter(self.max_requests_per_second)
+        self._semaphore = None
+        self._semaphore_loop = None
+        
+        # PMID -> PMC ID ("" if none) for every availability check so far
+        self._pmc_links = {}
+        
         self.session = requests.Session()
         
+        # Large enough pool for concurrent requests; transient errors and 429s
+        # are retried with backoff (honoring Retry-After, which also pauses
+        # the rate limiter) before they surface
+        retries = BackoffRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            rate_limiter=self._rate_limiter
+        )
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': f'pubmed_cuttag_scraper/1.0 ({self.email})',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        
+        # Optional on-disk caches so reruns don't repeat every E-utilities call
+        # or rescan texts that have already been analyzed
+        self.cache = None
+        self.analysis_cache = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.cache = ResponseCache(os.path.join(cache_dir, 'responses.sqlite'))
+            self.analysis_cache = AnalysisCache(os.path.join(cache_dir, 'analysis.sqlite'))
+        
         # Common peak calling software patterns
         self.peak_callers = [
             'MACS2', 'MACS', 'MACS3', 'SEACR', 'GoPeaks', 'HOMER', 'PeakSeq',
@@ -51,10 +399,71 @@ class PubMedCUTTagScraper:
             r'identified peaks[:\s]+([^.,;]+)',
             r'peak identification[:\s]+([^.,;]+)',
             r'using\s+([^.,;]*peak[^.,;]*)',
-            r'([^.,;]*peak[^.,;]*)\s+was used',
-            r'([^.,;]*peak[^.,;]*)\s+software',
-            r'([^.,;]*peak[^.,;]*)\s+algorithm'
+            # These can only match from the start of a run without . , or ;
+            # (at most once per run), so the lookbehind skips the other start
+            # positions that would each rescan the run: linear, not quadratic
+            r'(?<![^.,;])([^.,;]*peak[^.,;]*)\s+was used',
+            r'(?<![^.,;])([^.,;]*peak[^.,;]*)\s+software',
+            r'(?<![^.,;])([^.,;]*peak[^.,;]*)\s+algorithm'
         ]
+        
+        # CUT&Tag related patterns
+        self.cuttag_patterns = [
+            r'cut&tag',
+            r'cut and tag',
+            r'cut-tag',
+            r'cuttag',
+            r'cleavage under targets and tagmentation',
+            r'cleavage under targets & tagmentation'
+        ]
+        
+        # ChIP-seq related patterns
+        self.chipseq_patterns = [
+            r'chip-seq',
+            r'chipseq',
+            r'chromatin immunoprecipitation',
+            r'chromatin immunoprecipitation sequencing',
+            r'chip sequencing',
+            r'immunoprecipitation.*sequencing',
+            r'ip.*seq',
+            r'chip.*seq'
+        ]
+        
+        self._compile_patterns()
+
+    def _scan_config(self) -> Tuple[List[str], List[str], List[str], List[str]]:
+        """The pattern lists scan_texts worker processes rebuild the extractors from."""
+        return (self.peak_callers, self.peak_calling_patterns,
+                self.cuttag_patterns, self.chipseq_patterns)
+
+    def _compile_patterns(self):
+        """Compile everything once so the extractors don't rebuild patterns per paper."""
+        self._peak_calling_re = [re.compile(p, re.IGNORECASE) for p in self.peak_calling_patterns]
+        # The CUT&Tag spellings never overlap, so one alternation finds the same
+        # matches as scanning for each spelling separately
+        self._cuttag_re = [re.compile('|'.join(self.cuttag_patterns), re.IGNORECASE)]
+        self._chipseq_re = [re.compile(p, re.IGNORECASE) for p in self.chipseq_patterns]
+        self._caller_lower = [(caller, caller.lower()) for caller in self.peak_callers]
+        # Lowercase caller name -> reported software (variants normalized)
+        self._caller_names = {
+            caller_lower: self.CALLER_ALIASES.get(caller_lower, caller)
+            for caller, caller_lower in self._caller_lower
+        }
+        self._token_re = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*')
+        self._methods_re = re.compile('|'.join(re.escape(k) for k in self.METHODS_KEYWORDS))
+        self._patterns_sha1 = hashlib.sha1(repr([
+            EXTRACTOR_VERSION, self.peak_calling_patterns, self.cuttag_patterns,
+            self.chipseq_patterns, self.peak_callers, self.FALSE_POSITIVE_PATTERNS,
+            self.METHODS_KEYWORDS
+        ]).encode('utf-8')).hexdigest()
+        
+        # Single automaton that finds every peak caller name in one pass
+        self._caller_automaton = None
+        if ahocorasick is not None:
+            self._caller_automaton = ahocorasick.Automaton()
+            for caller, caller_lower in self._caller_lower:
+                self._caller_automaton.add_word(caller_lower, caller)
+            self._caller_automaton.make_automaton()
 
     def search_pubmed(self, query: str, max_results: int = 100, year: int = None) -> List[str]:
         """
@@ -99,10 +508,10 @@ class PubMedCUTTagScraper:
             params['api_key'] = self.api_key
             
         try:
-            response = self.session.get(search_url, params=params)
-            response.raise_for_status()
+            # Never served from the cache, so reruns see newly indexed papers
+            response = self._request(search_url, params, use_cache=False)
             
-            data = response.json()
+            data = _json_loads(response.content)
             pmids = data.get('esearchresult', {}).get('idlist', [])
             total_found = data.get('esearchresult', {}).get('count', 0)
             
@@ -112,12 +521,15 @@ class PubMedCUTTagScraper:
         except requests.RequestException as e:
             print(f"Error searching PubMed: {e}")
             # Check if it's a rate limit error
-            if "429" in str(e) or "Too Many Requests" in str(e):
+            if _is_rate_limited(e):
                 print("\n⚠️  API rate limit exceeded during PubMed search!")
                 print("The script will now exit to avoid wasting time.")
                 print("Please wait a few minutes before running the script again.")
                 exit(1)
             return []
+        except ValueError as e:
+            print(f"Error parsing PubMed search response: {e}")
+            return []
 
     def search_pmc(self, query: str, max_results: int = 100, year: int = None) -> List[str]:
         """
@@ -162,10 +574,10 @@ class PubMedCUTTagScraper:
             params['api_key'] = self.api_key
             
         try:
-            response = self.session.get(search_url, params=params)
-            response.raise_for_status()
+            # Never served from the cache, so reruns see newly indexed papers
+            response = self._request(search_url, params, use_cache=False)
             
-            data = response.json()
+            data = _json_loads(response.content)
             pmc_ids = data.get('esearchresult', {}).get('idlist', [])
             total_found = data.get('esearchresult', {}).get('count', 0)
             
@@ -174,7 +586,7 @@ class PubMedCUTTagScraper:
             if not pmc_ids:
                 return []
             
-            # Get corresponding PubMed IDs
+            # Get corresponding PubMed IDs (POSTed, since the ID list can be long)
             elink_url = f"{self.base_url}elink.fcgi"
             elink_params = {
                 'dbfrom': 'pmc',
@@ -187,10 +599,9 @@ class PubMedCUTTagScraper:
             if self.api_key:
                 elink_params['api_key'] = self.api_key
                 
-            elink_response = self.session.get(elink_url, params=elink_params)
-            elink_response.raise_for_status()
+            elink_response = self._request(elink_url, elink_params, 'POST')
             
-            elink_data = elink_response.json()
+            elink_data = _json_loads(elink_response.content)
             pmids = []
             
             for linkset in elink_data.get('linksets', []):
@@ -199,18 +610,23 @@ class PubMedCUTTagScraper:
                     if linksetdb.get('linkname') == 'pmc_pubmed':
                         pmids.extend(linksetdb.get('links', []))
             
+            # Several PMC records can link to the same PubMed ID
+            pmids = list(dict.fromkeys(pmids))
             print(f"Found {len(pmids)} corresponding PubMed IDs")
             return pmids
             
         except requests.RequestException as e:
             print(f"Error searching PMC: {e}")
             # Check if it's a rate limit error
-            if "429" in str(e) or "Too Many Requests" in str(e):
+            if _is_rate_limited(e):
                 print("\n⚠️  API rate limit exceeded during PMC search!")
                 print("The script will now exit to avoid wasting time.")
                 print("Please wait a few minutes before running the script again.")
                 exit(1)
             return []
+        except ValueError as e:
+            print(f"Error parsing PMC search response: {e}")
+            return []
 
     def fetch_abstracts(self, pmids: List[str]) -> List[Dict]:
         """
@@ -222,55 +638,127 @@ class PubMedCUTTagScraper:
         Returns:
             List of dictionaries containing paper information
         """
+        return _run_sync(self.fetch_abstracts_async(pmids))
+
+    async def fetch_abstracts_async(self, pmids: List[str]) -> List[Dict]:
+        """
+        Fetch abstracts and metadata for given PubMed IDs, in concurrent batches.
+        
+        Args:
+            pmids: List of PubMed IDs
+            
+        Returns:
+            List of dictionaries containing paper information, in the order of
+            pmids, followed by any papers efetch returned under other PMIDs
+        """
+        pmids = list(dict.fromkeys(pmids))
         if not pmids:
             return []
             
         print(f"Fetching abstracts for {len(pmids)} papers...")
         
-        # Split into batches to avoid URL length limits
-        batch_size = 200
-        all_papers = []
+        # Articles are cached one PMID at a time, so overlapping searches
+        # only fetch the papers they have not seen yet
+        papers_by_pmid = {}
+        missing = pmids
+        if self.cache is not None:
+            missing = []
+            for pmid in pmids:
+                entry = self.cache.get(self._article_cache_key(pmid))
+                if entry is not None and self.cache.is_fresh(entry[3]):
+                    papers_by_pmid[pmid] = self._parse_article(etree.fromstring(entry[2]))
+                else:
+                    missing.append(pmid)
+            if papers_by_pmid:
+                print(f"Using cached records for {len(papers_by_pmid)} papers")
+        
+        batch_size = self.EFETCH_BATCH_SIZE_WITH_KEY if self.api_key else self.EFETCH_BATCH_SIZE
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+        fetch_url = f"{self.base_url}efetch.fcgi"
+        rate_limited = False
         
-        for i in range(0, len(pmids), batch_size):
-            batch_pmids = pmids[i:i + batch_size]
+        async def fetch_batch(batch: List[str]) -> List[Dict]:
+            nonlocal rate_limited
             
-            fetch_url = f"{self.base_url}efetch.fcgi"
+            # POSTed so long ID lists are not limited by URL length
             params = {
                 'db': 'pubmed',
-                'id': ','.join(batch_pmids),
+                'id': ','.join(batch),
                 'retmode': 'xml',
                 'email': self.email
             }
             
             if self.api_key:
                 params['api_key'] = self.api_key
+            
+            # The batch itself is not cached; its articles are, as they are parsed
+            store_blobs = self._cache_articles if self.cache is not None else None
+            papers = []
+            remaining = batch
+            for attempt in range(self.EFETCH_ATTEMPTS):
+                try:
+                    await self._run_limited(self._fetch_articles, fetch_url, params, papers, store_blobs)
+                    break
+                except requests.RequestException as e:
+                    print(f"Error fetching abstracts: {e}")
+                    # Check if it's a rate limit error
+                    if _is_rate_limited(e):
+                        rate_limited = True
+                        break
+                except etree.XMLSyntaxError as e:
+                    print(f"Error parsing XML: {e}")
                 
-            try:
-                response = self.session.get(fetch_url, params=params)
-                response.raise_for_status()
-                
-                # Parse XML response
-                root = ET.fromstring(response.content)
-                papers = self._parse_xml_papers(root)
-                all_papers.extend(papers)
-                
-                # Be nice to the API
-                time.sleep(0.1)
-                
-            except requests.RequestException as e:
-                print(f"Error fetching abstracts: {e}")
-                # Check if it's a rate limit error
-                if "429" in str(e) or "Too Many Requests" in str(e):
-                    print("\n⚠️  API rate limit exceeded during abstract fetching!")
-                    print("The script will now exit to avoid wasting time.")
-                    print("Please wait a few minutes before running the script again.")
-                    exit(1)
-                continue
-            except ET.ParseError as e:
-                print(f"Error parsing XML: {e}")
-                continue
-                
-        return all_papers
+                # Keep what was parsed and ask again only for the rest
+                returned = {paper['pmid'] for paper in papers}
+                remaining = [pmid for pmid in remaining if pmid not in returned]
+                if not remaining or attempt + 1 == self.EFETCH_ATTEMPTS:
+                    break
+                print(f"Retrying the {len(remaining)} papers the batch did not return...")
+                params['id'] = ','.join(remaining)
+            return papers
+        
+        results = await asyncio.gather(*[fetch_batch(batch) for batch in batches])
+        
+        if rate_limited:
+            print("\n⚠️  API rate limit exceeded during abstract fetching!")
+            print("The script will now exit to avoid wasting time.")
+            print("Please wait a few minutes before running the script again.")
+            exit(1)
+        
+        for papers in results:
+            for paper in papers:
+                papers_by_pmid.setdefault(paper['pmid'], paper)
+        
+        # Requested order first, then anything efetch returned under another PMID
+        ordered = [papers_by_pmid.pop(pmid) for pmid in pmids if pmid in papers_by_pmid]
+        return ordered + list(papers_by_pmid.values())
+
+    def _article_cache_key(self, pmid: str) -> str:
+        """Cache key for a single PubmedArticle record."""
+        return self.cache.make_key(f"{self.base_url}efetch.fcgi#article", {'db': 'pubmed', 'id': pmid})
+
+    def _cache_articles(self, blobs: Dict[str, bytes]):
+        """Store PubmedArticle records (XML keyed by PMID) in the response cache."""
+        self.cache.put_many({self._article_cache_key(pmid): blob for pmid, blob in blobs.items()})
+
+    async def fetch_abstracts_and_pmc_links_async(self, pmids: List[str]) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        Fetch abstracts and check PMC availability at the same time.
+        
+        The two lookups are independent, so their requests are interleaved
+        under the shared rate limit instead of running one phase after the other.
+        
+        Args:
+            pmids: List of PubMed IDs
+            
+        Returns:
+            Tuple of (papers, mapping of PMID to PMC ID)
+        """
+        papers, pmc_mapping = await asyncio.gather(
+            self.fetch_abstracts_async(pmids),
+            self.check_pmc_availability_async(pmids)
+        )
+        return papers, pmc_mapping
 
     def check_pmc_availability(self, pmids: List[str]) -> Dict[str, str]:
         """
@@ -282,24 +770,51 @@ class PubMedCUTTagScraper:
         Returns:
             Dictionary mapping PMID to PMC ID if available
         """
+        return _run_sync(self.check_pmc_availability_async(pmids))
+
+    async def check_pmc_availability_async(self, pmids: List[str]) -> Dict[str, str]:
+        """
+        Check which papers have PMC full text available, in concurrent batches.
+        
+        Args:
+            pmids: List of PubMed IDs
+            
+        Returns:
+            Dictionary mapping PMID to PMC ID if available
+        """
+        pmids = list(dict.fromkeys(pmids))
         if not pmids:
             return {}
             
         print(f"Checking PMC availability for {len(pmids)} papers...")
         
-        # Check PMC availability one paper at a time to avoid rate limits
-        batch_size = 1
+        # Links found earlier in this session (or cached on disk) are reused
         pmc_mapping = {}
+        missing = []
+        for pmid in pmids:
+            pmc_id = self._known_pmc_link(pmid)
+            if pmc_id is None:
+                missing.append(pmid)
+            elif pmc_id:
+                pmc_mapping[pmid] = pmc_id
+        if len(missing) < len(pmids):
+            print(f"Using known PMC links for {len(pmids) - len(missing)} papers")
+        
+        # elink takes many IDs per request
+        batch_size = 200
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+        elink_url = f"{self.base_url}elink.fcgi"
         
-        for i, pmid in enumerate(pmids):
-            print(f"Checking PMC availability for paper {i+1}/{len(pmids)} (PMID: {pmid})...")
+        async def check_batch(i: int, batch: List[str]):
+            print(f"Checking PMC availability for batch {i+1}/{len(batches)} ({len(batch)} papers)...")
             
-            # Use elink to find PMC IDs
-            elink_url = f"{self.base_url}elink.fcgi"
+            # Passing each PMID as its own id= parameter (rather than one
+            # comma-joined value) makes elink return one linkset per PMID;
+            # the batch is POSTed since 200 repeated ids make a long URL
             params = {
                 'dbfrom': 'pubmed',
                 'db': 'pmc',
-                'id': pmid,
+                'id': batch,
                 'retmode': 'json',
                 'email': self.email
             }
@@ -308,47 +823,115 @@ class PubMedCUTTagScraper:
                 params['api_key'] = self.api_key
                 
             try:
-                response = self.session.get(elink_url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                linksets = data.get('linksets', [])
-                
-                for linkset in linksets:
-                    pmid = linkset.get('ids', [''])[0]
-                    linksetdbs = linkset.get('linksetdbs', [])
-                    
-                    # Look for the main PMC link (not references)
-                    for linksetdb in linksetdbs:
-                        if linksetdb.get('linkname') == 'pubmed_pmc':
-                            pmc_ids = linksetdb.get('links', [])
-                            if pmc_ids:
-                                pmc_mapping[pmid] = pmc_ids[0]
-                            break
-                
-                time.sleep(2.5)  # Be patient with the API to avoid rate limits
-                
+                # Results are cached per PMID below rather than per batch
+                response = await self._request_async(elink_url, params, 'POST', use_cache=False)
+                data = _json_loads(response.content)
             except requests.RequestException as e:
                 print(f"Error checking PMC availability: {e}")
                 # Check if it's a rate limit error
-                if "429" in str(e) or "Too Many Requests" in str(e):
-                    print("\n⚠️  API rate limit exceeded!")
-                    print("The script will now exit to avoid wasting time.")
+                if _is_rate_limited(e):
+                    print("\n⚠️  API rate limit exceeded even after retrying!")
                     print("Please wait a few minutes before running the script again.")
-                    return pmc_mapping
-                continue
+                return
+            except ValueError as e:
+                print(f"Error parsing PMC availability response: {e}")
+                return
             
-            # Add delay between each paper
-            if i < len(pmids) - 1:
-                time.sleep(2.5)
+            # An error body says nothing about the batch, so none of it is
+            # remembered and the next run asks again
+            if 'ERROR' in data:
+                print(f"Error checking PMC availability: {data['ERROR']}")
+                return
+            
+            # PMIDs that came back without a pubmed_pmc link are remembered as
+            # having no PMC copy; PMIDs missing from the response stay unknown
+            links = {}
+            for linkset in data.get('linksets', []):
+                ids = linkset.get('ids') or []
+                if not ids:
+                    continue
+                pmid = str(ids[0])
+                links[pmid] = ''
+                linksetdbs = linkset.get('linksetdbs', [])
+                
+                # Look for the main PMC link (not references)
+                for linksetdb in linksetdbs:
+                    if linksetdb.get('linkname') == 'pubmed_pmc':
+                        pmc_ids = linksetdb.get('links', [])
+                        if pmc_ids:
+                            links[pmid] = pmc_ids[0]
+                            pmc_mapping[pmid] = pmc_ids[0]
+                        break
+            self._remember_pmc_links(links)
+        
+        await asyncio.gather(*[check_batch(i, batch) for i, batch in enumerate(batches)])
         
         print(f"Found {len(pmc_mapping)} papers with PMC full text available")
         return pmc_mapping
 
+    def _known_pmc_link(self, pmid: str) -> Optional[str]:
+        """
+        Look up an earlier PMC availability result for a PMID.
+        
+        Returns:
+            The PMC ID, "" if the paper has no PMC copy, or None if unknown
+        """
+        if pmid in self._pmc_links:
+            return self._pmc_links[pmid]
+        if self.cache is not None:
+            entry = self.cache.get(self._pmc_link_cache_key(pmid))
+            if entry is not None and self.cache.is_fresh(entry[3]):
+                pmc_id = entry[2].decode('ascii')
+                self._pmc_links[pmid] = pmc_id
+                return pmc_id
+        return None
+
+    def _remember_pmc_links(self, links: Dict[str, str]):
+        """Record PMC availability results ("" for no PMC copy) for later lookups."""
+        self._pmc_links.update(links)
+        if self.cache is not None and links:
+            self.cache.put_many({
+                self._pmc_link_cache_key(pmid): pmc_id.encode('ascii') for pmid, pmc_id in links.items()
+            })
+
+    def _pmc_link_cache_key(self, pmid: str) -> str:
+        """Cache key for the PMC availability of a single PMID."""
+        return self.cache.make_key(f"{self.base_url}elink.fcgi#pmc", {'dbfrom': 'pubmed', 'id': pmid})
+
     def fetch_pmc_full_text(self, pmc_id: str) -> str:
         """
         Fetch full text from PMC.
         
+        Args:
+            pmc_id: PMC ID
+            
+        Returns:
+            Full text content
+        """
+        return _run_sync(self.fetch_pmc_full_text_async(pmc_id))
+
+    async def fetch_pmc_full_texts_async(self, pmc_ids: List[str]) -> Dict[str, str]:
+        """
+        Fetch full text for several PMC articles concurrently.
+        
+        Args:
+            pmc_ids: List of PMC IDs
+            
+        Returns:
+            Dictionary mapping PMC ID to full text ("" if it could not be fetched)
+        """
+        pmc_ids = list(dict.fromkeys(pmc_ids))
+        if not pmc_ids:
+            return {}
+        
+        print(f"Fetching PMC full text for {len(pmc_ids)} papers...")
+        texts = await asyncio.gather(*[self.fetch_pmc_full_text_async(pmc_id) for pmc_id in pmc_ids])
+        return dict(zip(pmc_ids, texts))
+
+    async def fetch_pmc_full_text_async(self, pmc_id: str) -> str:
+        """
+        Fetch full text from PMC without blocking the event loop.
+        
         Args:
             pmc_id: PMC ID
             
@@ -367,96 +950,427 @@ class PubMedCUTTagScraper:
             params['api_key'] = self.api_key
             
         try:
-            response = self.session.get(fetch_url, params=params)
-            response.raise_for_status()
+            # The body is streamed into the parser; only the extracted text is kept
+            if self.cache is not None:
+                entry = self.cache.get(self.cache.make_key(f"{fetch_url}#text", params))
+                if entry is not None and self.cache.is_fresh(entry[3]):
+                    return entry[2].decode('utf-8')
             
-            # Parse XML and extract text content
-            root = ET.fromstring(response.content)
-            
-            # Extract text from all text nodes
-            full_text = ""
-            for elem in root.iter():
-                if elem.text:
-                    full_text += elem.text + " "
-                if elem.tail:
-                    full_text += elem.tail + " "
-            
-            time.sleep(1.0)  # Be nice to the API
-            return full_text.strip()
+            return await self._run_limited(self._fetch_pmc_text, fetch_url, params)
             
         except requests.RequestException as e:
             print(f"Error fetching PMC full text for {pmc_id}: {e}")
             # Check if it's a rate limit error
-            if "429" in str(e) or "Too Many Requests" in str(e):
-                print("\n⚠️  API rate limit exceeded during PMC text fetching!")
-                print("The script will now exit to avoid wasting time.")
+            if _is_rate_limited(e):
+                print("\n⚠️  API rate limit exceeded during PMC text fetching, even after retrying!")
                 print("Please wait a few minutes before running the script again.")
-                exit(1)
             return ""
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             print(f"Error parsing PMC XML for {pmc_id}: {e}")
             return ""
 
-    def _parse_xml_papers(self, root: ET.Element) -> List[Dict]:
-        """Parse XML response from PubMed into paper dictionaries."""
-        papers = []
-        
-        for article in root.findall('.//PubmedArticle'):
-            paper = {}
-            
-            # Extract PMID
-            pmid_elem = article.find('.//PMID')
-            paper['pmid'] = pmid_elem.text if pmid_elem is not None else 'Unknown'
-            
-            # Extract title
-            title_elem = article.find('.//ArticleTitle')
-            paper['title'] = title_elem.text if title_elem is not None else 'No title'
-            
-            # Extract abstract
-            abstract_elem = article.find('.//AbstractText')
-            paper['abstract'] = abstract_elem.text if abstract_elem is not None else 'No abstract'
-            
-            # Extract authors
-            authors = []
-            for author in article.findall('.//Author'):
-                last_name = author.find('LastName')
-                first_name = author.find('ForeName')
-                if last_name is not None:
-                    author_name = last_name.text
-                    if first_name is not None:
-                        author_name += f" {first_name.text}"
-                    authors.append(author_name)
-            paper['authors'] = ', '.join(authors[:5])  # Limit to first 5 authors
-            
-            # Extract journal
-            journal_elem = article.find('.//Journal/Title')
-            paper['journal'] = journal_elem.text if journal_elem is not None else 'Unknown journal'
-            
-            # Extract publication date
-            pub_date = article.find('.//PubDate')
-            if pub_date is not None:
-                year = pub_date.find('Year')
-                month = pub_date.find('Month')
-                day = pub_date.find('Day')
-                date_parts = []
-                if year is not None:
-                    date_parts.append(year.text)
-                if month is not None:
-                    date_parts.append(month.text)
-                if day is not None:
-                    date_parts.append(day.text)
-                paper['publication_date'] = ' '.join(date_parts)
+    async def _request_async(self, url: str, params: Dict, method: str = 'GET',
+                             use_cache: bool = True) -> requests.Response:
+        """
+        Request a URL on a worker thread while respecting NCBI's rate limit.
+        
+        Fresh cache hits are returned without waiting for a request slot.
+        
+        Args:
+            url: URL to fetch
+            params: Query parameters (sent as form data for POST)
+            method: 'GET' or 'POST'
+            use_cache: Set to False to bypass the response cache
+            
+        Returns:
+            The response (raises requests.HTTPError on failure)
+        """
+        if self.cache is not None and use_cache:
+            entry = self.cache.get(self.cache.make_key(url, params))
+            if entry is not None and self.cache.is_fresh(entry[3]):
+                return self._cached_response(url, entry[2])
+        
+        return await self._run_limited(self._request, url, params, method, use_cache)
+
+    async def _run_limited(self, fetch, *args):
+        """
+        Run a blocking request function on a worker thread within NCBI's rate limit.
+        
+        Args:
+            fetch: Function that performs the request
+            *args: Arguments passed to fetch
+            
+        Returns:
+            Whatever fetch returns
+        """
+        # Semaphores belong to an event loop, so make a fresh one per loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_requests_per_second)
+            self._semaphore_loop = loop
+        
+        # The rate limit itself is applied on the thread, right before sending
+        async with self._semaphore:
+            return await asyncio.to_thread(fetch, *args)
+
+    def _request(self, url: str, params: Dict, method: str = 'GET',
+                 use_cache: bool = True) -> requests.Response:
+        """
+        Request a URL through the on-disk cache when one is configured.
+        
+        Retries for 429 and 5xx responses are handled by the session's adapter,
+        which also waits out any Retry-After header. POST is used for long ID
+        lists that would not fit in a URL; E-utilities answer both methods
+        alike, so they share cache entries.
+        
+        Args:
+            url: URL to fetch
+            params: Query parameters (sent as form data for POST)
+            method: 'GET' or 'POST'
+            use_cache: Set to False to bypass the response cache
+            
+        Returns:
+            The response (raises requests.HTTPError on failure)
+        """
+        if self.cache is None or not use_cache:
+            response = self._send(url, params, method)
+            response.raise_for_status()
+            return response
+        
+        key = self.cache.make_key(url, params)
+        entry = self.cache.get(key)
+        headers = {}
+        if entry is not None:
+            etag, last_modified, body, fetched_at = entry
+            if self.cache.is_fresh(fetched_at):
+                return self._cached_response(url, body)
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        response = self._send(url, params, method, headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(key)
+            return self._cached_response(url, entry[2])
+        
+        response.raise_for_status()
+        self.cache.put(key, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                       response.content)
+        return response
+
+    def _send(self, url: str, params: Dict, method: str, headers: Optional[Dict] = None) -> requests.Response:
+        """Send a GET with query parameters or a POST with form data, within the rate limit."""
+        self._rate_limiter.wait()
+        if method == 'POST':
+            return self.session.post(url, data=params, headers=headers, timeout=self.REQUEST_TIMEOUT)
+        return self.session.get(url, params=params, headers=headers, timeout=self.REQUEST_TIMEOUT)
+
+    def _fetch_articles(self, url: str, params: Dict, papers: List[Dict],
+                        store_blobs: Optional[Callable[[Dict[str, bytes]], None]] = None):
+        """
+        POST an efetch batch and parse its articles while the body streams in.
+        
+        Batches can hold thousands of articles, so the XML is never buffered
+        whole; see _iter_xml_papers for the parsing. Papers are appended as
+        they are parsed, so the ones read before a failure are kept.
+        
+        Args:
+            url: efetch URL
+            params: Form parameters
+            papers: List the parsed paper dictionaries are appended to
+            store_blobs: If given, called with each article's own XML keyed by PMID
+            
+        Raises:
+            requests.RequestException or etree.XMLSyntaxError if the batch
+            could not be read to the end
+        """
+        self._rate_limiter.wait()
+        with self.session.post(url, data=params, stream=True, timeout=self.REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with _stream_errors_as_requests():
+                papers.extend(self._iter_xml_papers(response.raw, store_blobs))
+
+    def _fetch_pmc_text(self, url: str, params: Dict) -> str:
+        """
+        Stream a PMC efetch response straight into the XML parser.
+        
+        Large articles are never held in memory as raw XML. When caching is
+        enabled the extracted text is stored instead of the XML, keyed
+        separately from ordinary responses, and revalidated like them.
+        
+        Args:
+            url: efetch URL
+            params: Query parameters
+            
+        Returns:
+            Full text content (raises requests.HTTPError on failure)
+        """
+        key = entry = None
+        headers = {}
+        if self.cache is not None:
+            key = self.cache.make_key(f"{url}#text", params)
+            entry = self.cache.get(key)
+            if entry is not None:
+                etag, last_modified, body, fetched_at = entry
+                if self.cache.is_fresh(fetched_at):
+                    return body.decode('utf-8')
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+        
+        self._rate_limiter.wait()
+        with self.session.get(url, params=params, headers=headers, stream=True,
+                              timeout=self.REQUEST_TIMEOUT) as response:
+            if response.status_code == 304 and entry is not None:
+                self.cache.touch(key)
+                return entry[2].decode('utf-8')
+            
+            response.raise_for_status()
+            # Let urllib3 undo gzip/deflate while the parser reads
+            response.raw.decode_content = True
+            with _stream_errors_as_requests():
+                text = self._extract_pmc_text(response.raw)
+        
+        if self.cache is not None:
+            self.cache.put(key, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                           text.encode('utf-8'))
+        return text
+
+    @staticmethod
+    def _cached_response(url: str, body: bytes) -> requests.Response:
+        """Wrap a cached body in a Response so callers can't tell it apart."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = body
+        response.encoding = 'utf-8'
+        return response
+
+    @staticmethod
+    def _extract_pmc_text(source) -> str:
+        """
+        Extract all text from a PMC XML document while streaming it.
+        
+        Text and tails are emitted in document order and finished elements are
+        dropped from the tree as soon as they are no longer needed, so only the
+        currently open elements stay in memory.
+        
+        Args:
+            source: Raw PMC efetch XML, as bytes or a readable file-like object
+            
+        Returns:
+            Full text content
+        """
+        parts = []
+        # One [element, last finished child] frame per open element
+        stack = []
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        # Comments would carry their own tails, which the walk below never visits
+        for event, elem in etree.iterparse(source, events=('start', 'end'), huge_tree=True,
+                                           remove_comments=True, remove_pis=True):
+            if event == 'start':
+                if stack:
+                    frame = stack[-1]
+                    parent, previous = frame
+                    if previous is None:
+                        parts.append(parent.text)
+                    else:
+                        parts.append(previous.tail)
+                        parent.remove(previous)
+                    frame[1] = elem
+                stack.append([elem, None])
             else:
-                paper['publication_date'] = 'Unknown date'
+                elem, last_child = stack.pop()
+                if last_child is None:
+                    parts.append(elem.text)
+                else:
+                    parts.append(last_child.tail)
+                    elem.remove(last_child)
+        
+        # Join once; += would copy the growing string for every node
+        return " ".join(part for part in parts if part).strip()
+
+    def _iter_xml_papers(self, source,
+                         store_blobs: Optional[Callable[[Dict[str, bytes]], None]] = None) -> Iterator[Dict]:
+        """
+        Stream-parse an efetch response from PubMed into paper dictionaries.
+        
+        Each PubmedArticle is released as soon as it has been parsed, so memory
+        use does not grow with the size of the batch. Field lookups use XPath
+        expressions compiled once at import.
+        
+        Args:
+            source: Raw efetch XML, as bytes or a readable file-like object
+            store_blobs: If given, called with each article's own XML keyed by
+                PMID, every ARTICLE_CACHE_FLUSH_SIZE articles and at the end
+                (also when the stream fails), so the serialized articles are
+                not held for the whole batch
+        """
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        # huge_tree lifts libxml2's limits on text node size and nesting depth,
+        # which very large batches can otherwise trip
+        blobs = {}
+        try:
+            for _, article in etree.iterparse(source, events=('end',), tag='PubmedArticle',
+                                              huge_tree=True):
+                paper = self._parse_article(article)
+                if store_blobs is not None:
+                    blobs[paper['pmid']] = etree.tostring(article, with_tail=False)
+                    if len(blobs) >= self.ARTICLE_CACHE_FLUSH_SIZE:
+                        store_blobs(blobs)
+                        blobs = {}
+                yield paper
+                
+                # Drop this article and the ones already parsed before it
+                article.clear(keep_tail=True)
+                while article.getprevious() is not None:
+                    del article.getparent()[0]
+        finally:
+            if blobs:
+                store_blobs(blobs)
+
+    def _parse_article(self, article: etree._Element) -> Dict:
+        """Parse a single PubmedArticle element into a paper dictionary."""
+        paper = {}
+        
+        # Extract PMID
+        pmid_elems = _X_PMID(article)
+        paper['pmid'] = pmid_elems[0].text if pmid_elems else 'Unknown'
+        
+        # Extract title
+        title_elems = _X_TITLE(article)
+        paper['title'] = title_elems[0].text if title_elems else 'No title'
+        
+        # Extract abstract (structured abstracts have one AbstractText per section;
+        # OtherAbstract translations and plain-language summaries are left out)
+        abstract_elems = _X_ABSTRACT(article)
+        paper['abstract'] = ' '.join(
+            ''.join(section.itertext()) for section in abstract_elems
+        ) if abstract_elems else 'No abstract'
+        
+        # Extract authors
+        authors = []
+        for author in _X_AUTHORS(article):
+            last_name = author.find('LastName')
+            first_name = author.find('ForeName')
+            if last_name is not None:
+                author_name = last_name.text
+                if first_name is not None:
+                    author_name += f" {first_name.text}"
+                authors.append(author_name)
+        paper['authors'] = ', '.join(authors[:5])  # Limit to first 5 authors
+        
+        # Extract journal
+        journal_elems = _X_JOURNAL(article)
+        paper['journal'] = journal_elems[0].text if journal_elems else 'Unknown journal'
+        
+        # Extract publication date
+        pub_dates = _X_PUBDATE(article)
+        if pub_dates:
+            pub_date = pub_dates[0]
+            year = pub_date.find('Year')
+            month = pub_date.find('Month')
+            day = pub_date.find('Day')
+            date_parts = []
+            if year is not None:
+                date_parts.append(year.text)
+            if month is not None:
+                date_parts.append(month.text)
+            if day is not None:
+                date_parts.append(day.text)
+            paper['publication_date'] = ' '.join(date_parts)
+        else:
+            paper['publication_date'] = 'Unknown date'
+        
+        return paper
+
+    def scan_all(self, text: str) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Extract peak calling, CUT&Tag and ChIP-seq mentions in one call.
+        
+        With an analysis cache, text that was already scanned with the same
+        patterns is not scanned again.
+        
+        Args:
+            text: Text to search (abstract, title, full text, etc.)
             
-            papers.append(paper)
+        Returns:
+            Tuple of (peak calling mentions, CUT&Tag mentions, ChIP-seq mentions)
+        """
+        return self.scan_texts([text])[0]
+
+    def scan_texts(self, texts: List[str]) -> List[Tuple[List[str], List[str], List[str]]]:
+        """
+        Run scan_all over several texts, spreading uncached ones over worker processes.
+        
+        Args:
+            texts: Texts to search
+            
+        Returns:
+            One (peak calling, CUT&Tag, ChIP-seq) mentions tuple per text
+        """
+        return list(self.iter_scan_texts(texts))
+
+    def iter_scan_texts(self, texts: List[str]) -> Iterator[Tuple[List[str], List[str], List[str]]]:
+        """
+        Like scan_texts, but yield each result in input order as soon as it is ready.
+        
+        Args:
+            texts: Texts to search
             
-        return papers
+        Yields:
+            One (peak calling, CUT&Tag, ChIP-seq) mentions tuple per text
+        """
+        cached = [None] * len(texts)
+        content_sha1s = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if self.analysis_cache is not None:
+                content_sha1s[i] = hashlib.sha1(text.encode('utf-8')).hexdigest()
+                cached[i] = self.analysis_cache.get(content_sha1s[i], self._patterns_sha1)
+                if cached[i] is not None:
+                    continue
+            pending.append(text)
+        
+        # Scanning is pure CPU work, so independent texts can go to separate processes
+        if self.workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending)),
+                                     initializer=_init_scan_worker, initargs=(self._scan_config(),)) as executor:
+                scanned = executor.map(_scan_in_worker, pending, chunksize=8)
+                yield from self._merge_scan_results(cached, content_sha1s, scanned)
+        else:
+            yield from self._merge_scan_results(cached, content_sha1s, map(self._scan, pending))
+
+    def _merge_scan_results(self, cached: List, content_sha1s: List[Optional[str]],
+                            scanned: Iterator) -> Iterator[Tuple[List[str], List[str], List[str]]]:
+        """Interleave cached results with freshly scanned ones, caching the latter."""
+        for content_sha1, result in zip(content_sha1s, cached):
+            if result is None:
+                result = next(scanned)
+                if self.analysis_cache is not None:
+                    self.analysis_cache.put(content_sha1, self._patterns_sha1, result)
+            yield result
+
+    def _scan(self, text: str) -> Tuple[List[str], List[str], List[str]]:
+        """Run all three extractors over the text."""
+        return (
+            self.extract_peak_calling_info(text),
+            self.extract_cuttag_mentions(text),
+            self.extract_chipseq_mentions(text),
+        )
 
     def extract_peak_calling_info(self, text: str) -> List[str]:
         """
         Extract peak calling software mentions from text.
         
+        The patterns match case-insensitively on the original text; only the
+        short matched snippets are lowercased.
+        
         Args:
             text: Text to search (abstract, title, etc.)
             
@@ -464,28 +1378,84 @@ class PubMedCUTTagScraper:
             List of potential peak calling software mentions
         """
         mentions = []
-        text_lower = text.lower()
         
         # Look for specific patterns
-        for pattern in self.peak_calling_patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
+        for pattern in self._peak_calling_re:
+            matches = pattern.finditer(text)
             for match in matches:
-                mention = match.group(1).strip()
+                mention = match.group(1).strip().lower()
                 if mention and len(mention) < 100:  # Reasonable length filter
                     mentions.append(mention)
         
         # Also look for direct mentions of known peak callers
-        for caller in self.peak_callers:
-            if caller.lower() in text_lower:
-                # Find the context around the mention
-                pattern = rf'.{{0,50}}{re.escape(caller.lower())}.{{0,50}}'
-                context_matches = re.findall(pattern, text_lower)
-                for context in context_matches:
-                    # Filter out common false positives
-                    if not self._is_false_positive(context, caller):
-                        mentions.append(context.strip())
-        
-        return list(set(mentions))  # Remove duplicates
+        for end_idx, caller in self._find_callers(text):
+            # Take the context around the mention
+            start = max(0, end_idx - len(caller) - 49)
+            context = text[start:end_idx + 51].lower()
+            # Filter out common false positives (the context is already lowercase)
+            if not self._is_false_positive(context, caller, context_lower=context):
+                mentions.append(context.strip())
+        
+        return list(dict.fromkeys(mentions))  # Remove duplicates, keeping text order
+
+    def _find_callers(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Find every case-insensitive occurrence of a known peak caller name.
+        
+        Args:
+            text: Text to search
+            
+        Returns:
+            List of (index of the last matched character, peak caller) in text order
+        """
+        # Lowercase one chunk at a time (overlapping by the longest name) rather
+        # than copying the whole text, then match the lowercase names directly
+        hits = []
+        chunk_size = self._LOWER_CHUNK_SIZE
+        overlap = max(len(caller) for caller in self.peak_callers) - 1
+        for chunk_start in range(0, len(text), chunk_size):
+            chunk = text[chunk_start:chunk_start + chunk_size + overlap]
+            # 'İ' is the one character whose lowercase is longer; keep offsets aligned
+            chunk = chunk.replace('\u0130', 'I').lower()
+            if self._caller_automaton is not None:
+                chunk_hits = self._caller_automaton.iter(chunk)
+            else:
+                chunk_hits = self._find_caller_names(chunk)
+            for end_idx, caller in chunk_hits:
+                # Matches starting in the overlap belong to the next chunk
+                if end_idx - len(caller) + 1 < chunk_size:
+                    hits.append((chunk_start + end_idx, caller))
+        hits.sort()
+        return hits
+
+    def _find_caller_names(self, text_lower: str) -> List[Tuple[int, str]]:
+        """Fallback for when pyahocorasick is not installed: str.find per caller name."""
+        hits = []
+        for caller, caller_lower in self._caller_lower:
+            idx = text_lower.find(caller_lower)
+            while idx != -1:
+                hits.append((idx + len(caller_lower) - 1, caller))
+                idx = text_lower.find(caller_lower, idx + 1)
+        return hits
+
+    def identify_peak_callers(self, mentions: List[str]) -> List[str]:
+        """
+        Name the known peak callers that appear as words in the mentions.
+        
+        Args:
+            mentions: Peak calling mentions from extract_peak_calling_info
+            
+        Returns:
+            Sorted list of peak callers, with variants normalized (MACS2 -> MACS)
+        """
+        identified = set()
+        for mention in mentions:
+            tokens = set(self._token_re.findall(mention.lower()))
+            # Hyphenated words also count by their parts ("seacr-based")
+            tokens.update([part for token in tokens if '-' in token for part in token.split('-')])
+            for name in tokens & self._caller_names.keys():
+                identified.add(self._caller_names[name])
+        return sorted(identified)
 
     def extract_cuttag_mentions(self, text: str) -> List[str]:
         """
@@ -497,30 +1467,7 @@ class PubMedCUTTagScraper:
         Returns:
             List of CUT&Tag methodology mentions
         """
-        mentions = []
-        text_lower = text.lower()
-        
-        # CUT&Tag related patterns
-        cuttag_patterns = [
-            r'cut&tag',
-            r'cut and tag',
-            r'cut-tag',
-            r'cuttag',
-            r'cleavage under targets and tagmentation',
-            r'cleavage under targets & tagmentation'
-        ]
-        
-        for pattern in cuttag_patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-            for match in matches:
-                # Get context around the mention
-                start = max(0, match.start() - 50)
-                end = min(len(text), match.end() + 50)
-                context = text[start:end].strip()
-                if context and len(context) < 200:  # Reasonable length filter
-                    mentions.append(context)
-        
-        return list(set(mentions))  # Remove duplicates
+        return self._extract_method_mentions(self._cuttag_re, text)
 
     def extract_chipseq_mentions(self, text: str) -> List[str]:
         """
@@ -532,23 +1479,14 @@ class PubMedCUTTagScraper:
         Returns:
             List of ChIP-seq methodology mentions
         """
+        return self._extract_method_mentions(self._chipseq_re, text)
+
+    def _extract_method_mentions(self, patterns: List[re.Pattern], text: str) -> List[str]:
+        """Collect the context around every match of the given methodology patterns."""
         mentions = []
-        text_lower = text.lower()
         
-        # ChIP-seq related patterns
-        chipseq_patterns = [
-            r'chip-seq',
-            r'chipseq',
-            r'chromatin immunoprecipitation',
-            r'chromatin immunoprecipitation sequencing',
-            r'chip sequencing',
-            r'immunoprecipitation.*sequencing',
-            r'ip.*seq',
-            r'chip.*seq'
-        ]
-        
-        for pattern in chipseq_patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
+        for pattern in patterns:
+            matches = pattern.finditer(text)
             for match in matches:
                 # Get context around the mention
                 start = max(0, match.start() - 50)
@@ -557,149 +1495,195 @@ class PubMedCUTTagScraper:
                 if context and len(context) < 200:  # Reasonable length filter
                     mentions.append(context)
         
-        return list(set(mentions))  # Remove duplicates
+        return list(dict.fromkeys(mentions))  # Remove duplicates, keeping text order
 
-    def _is_false_positive(self, context: str, caller: str) -> bool:
+    def _is_false_positive(self, context: str, caller: str, context_lower: Optional[str] = None) -> bool:
         """
         Check if a peak caller mention is likely a false positive.
         
         Args:
             context: The text context around the mention
             caller: The peak caller name
+            context_lower: Optional precomputed context.lower()
             
         Returns:
             True if this is likely a false positive
         """
-        context_lower = context.lower()
+        if context_lower is None:
+            context_lower = context.lower()
         
         # Common false positive patterns
-        false_positive_patterns = {
-            'quest': ['question', 'questionnaire', 'request', 'conquest'],
-            'macs': ['macintosh', 'mac address', 'macbook'],
-            'homer': ['homer simpson', 'homeric', 'homerun'],
-            'peaks': ['mountain peaks', 'peak performance', 'peak hours'],
-        }
-        
-        if caller.lower() in false_positive_patterns:
-            for pattern in false_positive_patterns[caller.lower()]:
-                if pattern in context_lower:
-                    return True
+        bad_patterns = self.FALSE_POSITIVE_PATTERNS.get(caller.lower())
+        if bad_patterns and any(pattern in context_lower for pattern in bad_patterns):
+            return True
         
         # Check if it's in a methods/peak calling context
-        methods_keywords = ['peak', 'calling', 'detection', 'identification', 'analysis', 'software', 'tool', 'algorithm', 'method']
-        if any(keyword in context_lower for keyword in methods_keywords):
+        if self._methods_re.search(context_lower):
             return False
         
         # If no methods context, likely false positive
         return True
 
-    def analyze_papers(self, papers: List[Dict], pmc_mapping: Dict[str, str] = None) -> List[Dict]:
+    def analyze_papers(self, papers: List[Dict], pmc_mapping: Dict[str, str] = None,
+                       pmc_texts: Dict[str, str] = None) -> Iterator[Dict]:
         """
         Analyze papers to extract peak calling information.
         
+        Papers are handled ANALYSIS_WINDOW at a time. When pmc_texts is not
+        given, each window's full texts are fetched, scanned and let go before
+        the next window is fetched, so memory does not grow with the corpus.
+        
         Args:
             papers: List of paper dictionaries
             pmc_mapping: Dictionary mapping PMID to PMC ID for full text access
+            pmc_texts: Dictionary mapping PMC ID to already fetched full text;
+                fetched concurrently here, one window at a time, when not given
             
-        Returns:
-            List of papers with peak calling information added
+        Yields:
+            Each paper with peak calling information added, as soon as it is analyzed
         """
-        print("Analyzing papers for peak calling information...")
-        
         if pmc_mapping is None:
             pmc_mapping = {}
         
-        for i, paper in enumerate(papers):
-            title = paper.get('title', 'No title')
-            if title is None:
-                title = 'No title'
-            print(f"Analyzing paper {i+1}/{len(papers)}: {title[:50]}...")
-            
-            # Start with title and abstract
-            paper_title = paper.get('title', 'No title') or 'No title'
-            paper_abstract = paper.get('abstract', 'No abstract') or 'No abstract'
-            full_text = f"{paper_title} {paper_abstract}"
-            text_source = "abstract"
+        print("Analyzing papers for peak calling information...")
+        
+        for start in range(0, len(papers), self.ANALYSIS_WINDOW):
+            window = papers[start:start + self.ANALYSIS_WINDOW]
+            window_texts = pmc_texts
+            if window_texts is None:
+                pmc_ids = [pmc_mapping[p['pmid']] for p in window if p['pmid'] in pmc_mapping]
+                window_texts = _run_sync(self.fetch_pmc_full_texts_async(pmc_ids))
             
-            # If PMC full text is available, use it instead
+            yield from self._analyze_window(window, pmc_mapping, window_texts, start, len(papers))
+
+    def _analyze_window(self, papers: List[Dict], pmc_mapping: Dict[str, str], pmc_texts: Dict[str, str],
+                        offset: int, total: int) -> Iterator[Dict]:
+        """
+        Scan one window of papers and yield them annotated, in order.
+        
+        Args:
+            papers: Papers in this window
+            pmc_mapping: Dictionary mapping PMID to PMC ID
+            pmc_texts: Dictionary mapping PMC ID to full text
+            offset: Position of the window's first paper, for progress output
+            total: Number of papers across all windows
+        """
+        # Pick the text to scan for each paper
+        texts = []
+        text_sources = []
+        source_notes = []
+        for paper in papers:
+            # Use PMC full text when available, otherwise title and abstract
             pmid = paper['pmid']
+            pmc_text = None
             if pmid in pmc_mapping:
                 pmc_id = pmc_mapping[pmid]
-                pmc_text = self.fetch_pmc_full_text(pmc_id)
+                pmc_text = pmc_texts.get(pmc_id, "")
                 if pmc_text:
-                    full_text = pmc_text
-                    text_source = "full_text"
-                    print(f"  Using PMC full text (PMC{pmc_id})")
+                    source_notes.append(f"  Using PMC full text (PMC{pmc_id})")
                 else:
-                    print(f"  PMC full text not available, using abstract")
-            else:
-                print(f"  No PMC access, using abstract")
-            
-            # Extract peak calling mentions
-            peak_mentions = self.extract_peak_calling_info(full_text)
-            paper['peak_calling_mentions'] = peak_mentions
-            paper['text_source'] = text_source
-            
-            # Extract CUT&Tag methodology mentions
-            cuttag_mentions = self.extract_cuttag_mentions(full_text)
-            paper['cuttag_mentions'] = cuttag_mentions
-            paper['has_cuttag'] = len(cuttag_mentions) > 0
-            
-            # Extract ChIP-seq methodology mentions
-            chipseq_mentions = self.extract_chipseq_mentions(full_text)
-            paper['chipseq_mentions'] = chipseq_mentions
-            paper['has_chipseq'] = len(chipseq_mentions) > 0
-            
-            # Add PubMed link for easy access
-            paper['pubmed_link'] = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-            
-            # Extract year from publication date
-            publication_date = paper.get('publication_date', '')
-            year = 'Unknown'
-            if publication_date and publication_date != 'Unknown date':
-                # Try to extract year from various date formats
-                year_match = re.search(r'\b(20\d{2})\b', publication_date)
-                if year_match:
-                    year = year_match.group(1)
-            paper['year_published'] = year
-            
-            # Try to identify specific software
-            identified_software = []
-            for mention in peak_mentions:
-                for caller in self.peak_callers:
-                    if caller.lower() in mention.lower():
-                        # Normalize variants to their main software
-                        if caller.lower() in ['macs2', 'macs3']:
-                            identified_software.append('MACS')
-                        elif caller.lower() == 'findpeaks':
-                            identified_software.append('HOMER')
-                        else:
-                            identified_software.append(caller)
-            
-            paper['identified_peak_callers'] = list(set(identified_software))
-            
-            # Add a summary
-            if paper['identified_peak_callers']:
-                paper['peak_calling_summary'] = f"Uses: {', '.join(paper['identified_peak_callers'])}"
-            elif paper['peak_calling_mentions']:
-                paper['peak_calling_summary'] = f"Possible mentions: {', '.join(paper['peak_calling_mentions'][:3])}"
+                    source_notes.append(f"  PMC full text not available, using abstract")
             else:
-                paper['peak_calling_summary'] = "No clear peak calling method identified"
+                source_notes.append(f"  No PMC access, using abstract")
+            
+            full_text, text_source = self._paper_text(paper, pmc_text)
+            texts.append(full_text)
+            text_sources.append(text_source)
+        
+        # Extract peak calling, CUT&Tag and ChIP-seq mentions; progress is
+        # reported as each result comes back, not when the text is picked
+        scan_results = self.iter_scan_texts(texts)
+        
+        for i, (paper, text_source, source_note, scan_result) in enumerate(
+                zip(papers, text_sources, source_notes, scan_results)):
+            title = paper.get('title', 'No title')
+            if title is None:
+                title = 'No title'
+            print(f"Analyzing paper {offset+i+1}/{total}: {title[:50]}...")
+            print(source_note)
             
-            # Be nice to the API
-            time.sleep(0.2)
+            yield self._annotate_paper(paper, text_source, scan_result)
+
+    @staticmethod
+    def _paper_text(paper: Dict, pmc_text: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Pick the text to scan for a paper.
+        
+        Args:
+            paper: Paper dictionary
+            pmc_text: PMC full text, if any was fetched
+            
+        Returns:
+            Tuple of (text, text source: "full_text" or "abstract")
+        """
+        if pmc_text:
+            return pmc_text, "full_text"
+        
+        paper_title = paper.get('title', 'No title') or 'No title'
+        paper_abstract = paper.get('abstract', 'No abstract') or 'No abstract'
+        return f"{paper_title} {paper_abstract}", "abstract"
+
+    def _annotate_paper(self, paper: Dict, text_source: str,
+                        scan_result: Tuple[List[str], List[str], List[str]]) -> Dict:
+        """
+        Add the peak calling fields derived from a scan result to a paper.
+        
+        Args:
+            paper: Paper dictionary (updated in place)
+            text_source: "full_text" or "abstract"
+            scan_result: (peak calling, CUT&Tag, ChIP-seq) mentions from scan_all
+            
+        Returns:
+            The same paper dictionary
+        """
+        pmid = paper['pmid']
+        peak_mentions, cuttag_mentions, chipseq_mentions = scan_result
+        paper['peak_calling_mentions'] = peak_mentions
+        paper['text_source'] = text_source
+        
+        paper['cuttag_mentions'] = cuttag_mentions
+        paper['has_cuttag'] = len(cuttag_mentions) > 0
+        
+        paper['chipseq_mentions'] = chipseq_mentions
+        paper['has_chipseq'] = len(chipseq_mentions) > 0
+        
+        # Add PubMed link for easy access
+        paper['pubmed_link'] = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+        
+        # Extract year from publication date
+        publication_date = paper.get('publication_date', '')
+        year = 'Unknown'
+        if publication_date and publication_date != 'Unknown date':
+            # Try to extract year from various date formats
+            year_match = re.search(r'\b(20\d{2})\b', publication_date)
+            if year_match:
+                year = year_match.group(1)
+        paper['year_published'] = year
+        
+        # Try to identify specific software
+        paper['identified_peak_callers'] = self.identify_peak_callers(peak_mentions)
+        
+        # Add a summary
+        if paper['identified_peak_callers']:
+            paper['peak_calling_summary'] = f"Uses: {', '.join(paper['identified_peak_callers'])}"
+        elif paper['peak_calling_mentions']:
+            paper['peak_calling_summary'] = f"Possible mentions: {', '.join(paper['peak_calling_mentions'][:3])}"
+        else:
+            paper['peak_calling_summary'] = "No clear peak calling method identified"
         
-        return papers
+        return paper
 
-    def save_results(self, papers: List[Dict], output_file: str, year: int = None, query: str = None):
+    def save_results(self, papers: Iterable[Dict], output_file: str, year: int = None, query: str = None,
+                     output_format: str = 'csv'):
         """
-        Save results to CSV and JSON files.
+        Save results to a CSV (or Parquet) file and a JSON Lines file, writing each paper as it arrives.
         
         Args:
-            papers: List of analyzed papers
+            papers: Analyzed papers (any iterable, e.g. the analyze_papers generator)
             output_file: Base filename for output files
             year: Optional year filter for filename
             query: Optional query for filename
+            output_format: 'csv', or 'parquet' (requires pyarrow) for the table file
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -707,35 +1691,43 @@ class PubMedCUTTagScraper:
         filename_parts = [output_file]
         if year:
             filename_parts.append(f"year{year}")
-        if query and query != "CUT&Tag OR \"CUT and Tag\"":
+        if query and query != DEFAULT_QUERY:
             # Clean up query for filename
             clean_query = query.replace(" ", "_").replace("&", "and").replace('"', "").replace("(", "").replace(")", "")
             filename_parts.append(clean_query[:20])  # Limit length
         
         base_filename = "_".join(filename_parts)
+        table_file = f"{base_filename}_{timestamp}.{output_format}"
+        json_file = f"{base_filename}_{timestamp}.jsonl"
         
-        # Save as CSV
-        csv_file = f"{base_filename}_{timestamp}.csv"
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            if papers:
-                writer = csv.DictWriter(f, fieldnames=papers[0].keys())
-                writer.writeheader()
-                writer.writerows(papers)
-        print(f"Results saved to {csv_file}")
+        # Summary statistics, accumulated while writing
+        total_papers = 0
+        papers_with_peak_callers = 0
+        papers_with_mentions = 0
+        papers_with_cuttag_mentions = 0
+        papers_with_chipseq_mentions = 0
+        caller_counts = {}
+        
+        with self._open_table_writer(table_file, output_format) as write_row, \
+                open(json_file, 'wb') as json_f:
+            for paper in papers:
+                write_row(paper)
+                json_f.write(_json_line(paper))
+                
+                total_papers += 1
+                papers_with_peak_callers += bool(paper['identified_peak_callers'])
+                papers_with_mentions += bool(paper['peak_calling_mentions'])
+                papers_with_cuttag_mentions += bool(paper['cuttag_mentions'])
+                papers_with_chipseq_mentions += bool(paper['chipseq_mentions'])
+                
+                # Count peak caller usage
+                for caller in paper['identified_peak_callers']:
+                    caller_counts[caller] = caller_counts.get(caller, 0) + 1
         
-        # Save as JSON
-        json_file = f"{base_filename}_{timestamp}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(papers, f, indent=2, ensure_ascii=False)
+        print(f"Results saved to {table_file}")
         print(f"Results also saved to {json_file}")
         
         # Print summary statistics
-        total_papers = len(papers)
-        papers_with_peak_callers = len([p for p in papers if p['identified_peak_callers']])
-        papers_with_mentions = len([p for p in papers if p['peak_calling_mentions']])
-        papers_with_cuttag_mentions = len([p for p in papers if p['cuttag_mentions']])
-        papers_with_chipseq_mentions = len([p for p in papers if p['chipseq_mentions']])
-        
         print(f"\nSummary:")
         print(f"Total papers analyzed: {total_papers}")
         print(f"Papers with identified peak callers: {papers_with_peak_callers}")
@@ -743,30 +1735,92 @@ class PubMedCUTTagScraper:
         print(f"Papers with CUT&Tag methodology mentions: {papers_with_cuttag_mentions}")
         print(f"Papers with ChIP-seq methodology mentions: {papers_with_chipseq_mentions}")
         
-        # Count peak caller usage
-        caller_counts = {}
-        for paper in papers:
-            for caller in paper['identified_peak_callers']:
-                caller_counts[caller] = caller_counts.get(caller, 0) + 1
-        
         if caller_counts:
             print(f"\nPeak caller usage:")
             for caller, count in sorted(caller_counts.items(), key=lambda x: x[1], reverse=True):
                 print(f"  {caller}: {count} papers")
 
+    @contextlib.contextmanager
+    def _open_table_writer(self, path: str, output_format: str) -> Iterator:
+        """
+        Open the CSV or Parquet results file and yield a function that writes one paper.
+        
+        Parquet rows are buffered and written PARQUET_ROW_GROUP_SIZE at a time,
+        with the mention lists stored as list columns instead of their repr.
+        """
+        if output_format == 'csv':
+            with open(path, 'w', newline='', encoding='utf-8') as csv_f:
+                writer = csv.DictWriter(csv_f, fieldnames=self.RESULT_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                yield writer.writerow
+            return
+        
+        if output_format != 'parquet':
+            raise ValueError(f"Unknown output format: {output_format}")
+        if pa is None:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        
+        def column_type(name: str):
+            if name in self.LIST_FIELDS:
+                return pa.list_(pa.string())
+            if name in self.BOOL_FIELDS:
+                return pa.bool_()
+            return pa.string()
+        
+        schema = pa.schema([(name, column_type(name)) for name in self.RESULT_FIELDS])
+        rows = []
+        
+        with pq.ParquetWriter(path, schema) as writer:
+            def write_row(paper: Dict):
+                rows.append(paper)
+                if len(rows) >= self.PARQUET_ROW_GROUP_SIZE:
+                    writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                    rows.clear()
+            
+            yield write_row
+            
+            if rows:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+
+# Scan-only scraper used by scan_texts() worker processes
+_worker_scraper = None
+
+def _init_scan_worker(config: Tuple[List[str], List[str], List[str], List[str]]):
+    """Compile the extractors from _scan_config(); no session or caches are set up."""
+    global _worker_scraper
+    scraper = PubMedCUTTagScraper.__new__(PubMedCUTTagScraper)
+    (scraper.peak_callers, scraper.peak_calling_patterns,
+     scraper.cuttag_patterns, scraper.chipseq_patterns) = config
+    scraper._compile_patterns()
+    _worker_scraper = scraper
+
+def _scan_in_worker(text: str) -> Tuple[List[str], List[str], List[str]]:
+    return _worker_scraper._scan(text)
+
 def main():
-    parser = argparse.ArgumentParser(description='Scrape PubMed for CUT&Tag papers and identify peak calling methods')
+    # Exact option names only, so e.g. --cache can't silently mean --cache-dir
+    parser = argparse.ArgumentParser(description='Scrape PubMed for CUT&Tag papers and identify peak calling methods',
+                                     allow_abbrev=False)
     parser.add_argument('--email', required=True, help='Your email address (required by NCBI)')
     parser.add_argument('--api-key', help='NCBI API key for higher rate limits (optional)')
     parser.add_argument('--max-results', type=int, default=100, help='Maximum number of papers to analyze')
     parser.add_argument('--year', type=int, help='Filter papers by publication year (e.g., 2019)')
     parser.add_argument('--output', default='cuttag_peakcaller_results', help='Output file prefix')
-    parser.add_argument('--query', default='CUT&Tag OR "CUT and Tag"', help='PubMed search query')
+    parser.add_argument('--query', default=DEFAULT_QUERY, help='PubMed search query')
+    parser.add_argument('--cache-dir', default='.pubmed_cache', help='Directory for the on-disk cache of NCBI responses and analysis results')
+    parser.add_argument('--workers', type=int, help='Number of processes used to scan papers (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Always query NCBI and rescan texts instead of using the cache')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help='Format of the results table; a JSON Lines copy is always written (parquet needs pyarrow)')
     
     args = parser.parse_args()
+    if args.format == 'parquet' and pa is None:
+        parser.error("--format parquet requires pyarrow (pip install pyarrow)")
     
     # Initialize scraper
-    scraper = PubMedCUTTagScraper(email=args.email, api_key=args.api_key)
+    scraper = PubMedCUTTagScraper(email=args.email, api_key=args.api_key,
+                                  cache_dir=None if args.no_cache else args.cache_dir,
+                                  workers=args.workers)
     
     # Search for papers (try PMC first, then PubMed)
     pmids = scraper.search_pmc(args.query, args.max_results, args.year)
@@ -778,21 +1832,19 @@ def main():
         print("No papers found. Exiting.")
         return
     
-    # Fetch abstracts
-    papers = scraper.fetch_abstracts(pmids)
+    # Fetch abstracts while checking for PMC full text availability
+    papers, pmc_mapping = asyncio.run(scraper.fetch_abstracts_and_pmc_links_async(pmids))
     
     if not papers:
         print("No papers retrieved. Exiting.")
         return
     
-    # Check for PMC full text availability
-    pmc_mapping = scraper.check_pmc_availability(pmids)
-    
-    # Analyze for peak calling information (using full text when available)
+    # Analyze for peak calling information (using full text when available);
+    # full texts are fetched a window at a time as the analysis reaches them
     analyzed_papers = scraper.analyze_papers(papers, pmc_mapping)
     
-    # Save results
-    scraper.save_results(analyzed_papers, args.output, args.year, args.query)
+    # Save results as each paper is analyzed
+    scraper.save_results(analyzed_papers, args.output, args.year, args.query, args.format)
 
 if __name__ == "__main__":
     main()
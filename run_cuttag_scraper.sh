@@ -55,4 +55,4 @@ python3 pubmed_cuttag_peakcaller_scraper.py \
     --output "$OUTPUT_PREFIX"
 
 echo ""
-echo "Analysis complete! Check the generated CSV and JSON files for results."
+echo "Analysis complete! Check the generated CSV and JSONL files for results."